@@ -12,6 +12,16 @@ import shlex
 from . import supplement
 from .. import completer, layout, eventing, session, paging
 
+_shlex_words = re.compile('[^ \t\r\n]+')
+
+
+def _shlex_split(line):
+    """ Same as `shlex.split` but lines without quotes or escapes, which is
+    most of them, are split by a regex instead of the shlex tokenizer. """
+    if '"' in line or "'" in line or '\\' in line:
+        return shlex.split(line)
+    return _shlex_words.findall(line)
+
 
 def parse_docstring(entity):
     """ Return sanitized docstring from an entity.  The first line of the
@@ -105,7 +115,7 @@ class Command(eventing.Eventer):
     def parse_args(self, argv=None):
         """ Return an argparse.Namespace of the argv string or sys.argv if
         argv is None. """
-        arg_input = shlex.split(argv) if argv is not None else None
+        arg_input = _shlex_split(argv) if argv is not None else None
         self.get_or_create_session()
         return self.argparser.parse_args(arg_input)
 
@@ -434,7 +444,7 @@ class Command(eventing.Eventer):
         remainder = []
         while True:
             try:
-                args = shlex.split(line)
+                args = _shlex_split(line)
             except ValueError:
                 remainder.append(line[-1])
                 line = line[:-1]
@@ -4,12 +4,15 @@ Tree layout.
 
 import collections
 import collections.abc
+import io
 import sys
 from .. import rendering
 
 
 class TreeNode(object):
 
+    __slots__ = ('value', 'label', 'children')
+
     def __init__(self, value, children=None, label=None):
         self.value = value
         self.label = label
@@ -50,7 +53,11 @@ class Tree(object):
                     line.append(self.tree_T)
             else:
                 line = ['']
-            yield rendering.vtmlrender(''.join(line + [self.formatter(x)]))
+            # Tree glyphs are plain text so only the formatter output needs
+            # to go through the VTML parser.
+            content = rendering.vtmlrender(self.formatter(x))
+            indent = ''.join(line)
+            yield rendering.VTMLBuffer(indent) + content if indent else content
             if x.children:
                 if prefix is not None:
                     line[-1] = '    ' if end == i else self.tree_vertspace
@@ -84,27 +91,33 @@ def treeprint(data, render_only=False, file=None, **options):
               not isinstance(obj, str)):
             return enumerate(obj)
 
-    def cycle_check(item, seen=set()):
-        item_id = id(item)
-        if item_id in seen:
-            raise ValueError('Cycle detected for: %s' % repr(item))
-        else:
-            seen.add(item_id)
-
-    def crawl(obj, cc=cycle_check):
-        cc(obj)
-        objiter = getiter(obj)
-        if objiter is None:
-            yield TreeNode(obj)
-        else:
+    def crawl(obj):
+        """ Build the node tree with an explicit stack instead of recursing
+        through a generator per level. """
+        seen = set()
+        roots = []
+        stack = [(obj, roots)]
+        while stack:
+            obj, nodes = stack.pop()
+            obj_id = id(obj)
+            if obj_id in seen:
+                raise ValueError('Cycle detected for: %s' % repr(obj))
+            seen.add(obj_id)
+            objiter = getiter(obj)
+            if objiter is None:
+                nodes.append(TreeNode(obj))
+                continue
             for key, item in objiter:
                 if isinstance(item, collections.abc.Iterable) and \
                    not isinstance(item, str):
-                    yield TreeNode(key, children=crawl(item))
+                    node = TreeNode(key)
+                    stack.append((item, node.children))
                 elif item is None:
-                    yield TreeNode(key)
+                    node = TreeNode(key)
                 else:
-                    yield TreeNode(key, label=item)
+                    node = TreeNode(key, label=item)
+                nodes.append(node)
+        return roots
     t = Tree(**options)
     render_gen = t.render(crawl(data))
     if render_only:
@@ -112,5 +125,7 @@ def treeprint(data, render_only=False, file=None, **options):
     else:
         file = sys.stdout if file is None else file
         conv = (lambda x: x.plain()) if not file.isatty() else (lambda x: x)
+        buf = io.StringIO()
         for x in render_gen:
-            print(conv(x), file=file)
+            print(conv(x), file=buf)
+        file.write(buf.getvalue())
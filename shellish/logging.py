@@ -18,6 +18,13 @@ class VTMLHandler(logging.StreamHandler):
     def format(self, record):
         return str(rendering.vtmlrender(super().format(record)))
 
+    def flush(self):
+        """ A line buffered stream (e.g. a tty) already wrote the record when
+        our newline terminator was written, so avoid the extra flush. """
+        if not self.terminator.endswith('\n') or \
+           not getattr(self.stream, 'line_buffering', False):
+            super().flush()
+
 
 class VTMLFormatter(logging.Formatter):
 
@@ -43,6 +50,9 @@ class VTMLFormatter(logging.Formatter):
         "name": '<green>%s</green>',
         "process": '<b>%s</b>',
     }
+    # Fields whose values are effectively fixed for the life of a process
+    # (or a logger) and are worth memoizing once formatted.
+    memo_fields = frozenset(('name', 'process', 'processName'))
 
     def __init__(self, fmt=None, field_prefmt=None, level_prefmt=None,
                  **kwargs):
@@ -52,6 +62,8 @@ class VTMLFormatter(logging.Formatter):
                                  if '%%(%s)' % k in fmt)
         self.level_prefmt = level_prefmt or self.default_level_prefmt
         self.asctime_prefmt = self.field_prefmt.pop('asctime', None)
+        self._levelname_memo = {}
+        self._field_memo = {}
         super().__init__(fmt=fmt, **kwargs)
 
     def formatException(self, ei):
@@ -65,7 +77,22 @@ class VTMLFormatter(logging.Formatter):
         return self.asctime_prefmt
 
     def format(self, record):
-        record.levelname = self.level_prefmt[record.levelno] % record.levelname
+        levelkey = record.levelno, record.levelname
+        try:
+            record.levelname = self._levelname_memo[levelkey]
+        except KeyError:
+            record.levelname = self.level_prefmt[record.levelno] % \
+                record.levelname
+            self._levelname_memo[levelkey] = record.levelname
         for key, fmt in self.field_prefmt.items():
-            setattr(record, key, fmt % getattr(record, key))
+            value = getattr(record, key)
+            if key in self.memo_fields:
+                memokey = key, value
+                try:
+                    value = self._field_memo[memokey]
+                except KeyError:
+                    value = self._field_memo[memokey] = fmt % value
+            else:
+                value = fmt % value
+            setattr(record, key, value)
         return super().format(record)
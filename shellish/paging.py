@@ -3,33 +3,48 @@ Support for directing output to a pager and then restoring tty state.
 """
 
 import contextlib
-import fcntl
+import functools
 import os
-import shutil
-import signal
-import subprocess
+import re
+import shlex
 import sys
-import termios
-import warnings
 
 _pager_active = False
+_shell_metachars = re.compile(r'[|&;<>()$`\\"\'*?\[\]{}~#=!\n]')
+# Pagers known to save and restore the terminal attributes themselves.
+_termios_safe_pagers = frozenset(('less', 'more', 'most'))
 
 
 @contextlib.contextmanager
-def tty_restoration(file=None):
+def tty_restoration(file=None, *, termios_save=True):
+    """ Save and restore the tty state of `file` around a context.  Files
+    that are not ttys have no such state and pass through untouched.  The
+    termios attributes may be left alone with `termios_save=False` when the
+    caller knows they won't be altered. """
     if file is None:
         file = sys.stdout
-    assert file.isatty()
-    tcsave = termios.tcgetattr(file)
-    fcsave = fcntl.fcntl(file, fcntl.F_GETFL)
+    if not file.isatty():
+        yield
+        return
+    # Imported on demand; most programs never page and so never need it.
+    import termios
+    fd = file.fileno()
+    tcsave = termios.tcgetattr(fd) if termios_save else None
+    blocking_save = os.get_blocking(fd)
     try:
         yield
     finally:
-        fcntl.fcntl(file, fcntl.F_SETFL, fcsave)
-        termios.tcsetattr(file, termios.TCSADRAIN, tcsave)
+        os.set_blocking(fd, blocking_save)
+        if tcsave is not None:
+            termios.tcsetattr(fd, termios.TCSADRAIN, tcsave)
 
 
 def pager_process(pagercmd, stdout=None, stderr=None):
+    """ Start the pager process.  A `str` command is run by the shell while
+    a sequence of args is executed directly. """
+    import shutil
+    import subprocess
+    import warnings
     if stdout is None:
         stdout = sys.stdout
     if stderr is None:
@@ -37,16 +52,37 @@ def pager_process(pagercmd, stdout=None, stderr=None):
     # When running interactively `less` does not handle window resizes
     # unless we explicitly hardcode the new term size into the env.  There
     # is currently a bug in docker for mac that sometimes breaks this test.
-    env = os.environ.copy()
     termsize = shutil.get_terminal_size()
     if 0 in termsize:
         warnings.warn("Could not determine terminal size")
         termsize = os.terminal_size((80, 24))
-    env['COLUMNS'] = str(termsize.columns)
-    env['LINES'] = str(termsize.lines)
-    return subprocess.Popen(pagercmd, shell=True, universal_newlines=True,
-                            bufsize=1, stdin=subprocess.PIPE, stdout=stdout,
-                            stderr=stderr, env=env)
+    columns = str(termsize.columns)
+    lines = str(termsize.lines)
+    if os.environ.get('COLUMNS') == columns and \
+       os.environ.get('LINES') == lines:
+        env = None  # Inherit as is; no need to copy the environment.
+    else:
+        env = dict(os.environ, COLUMNS=columns, LINES=lines)
+    popen = functools.partial(subprocess.Popen, universal_newlines=True,
+                              bufsize=1, stdin=subprocess.PIPE, stdout=stdout,
+                              stderr=stderr, env=env)
+    if not isinstance(pagercmd, str):
+        return popen(pagercmd)
+    if not _shell_metachars.search(pagercmd):
+        # Simple commands like "less -R" don't need a shell in between.
+        argv = shlex.split(pagercmd)
+        if argv:
+            try:
+                return popen(argv)
+            except OSError:
+                pass  # Let the shell report it as it normally would.
+    return popen(pagercmd, shell=True)
+
+
+def _restores_termios(pagercmd):
+    """ Does this pager command cleanup the tty attributes on its own? """
+    argv = pagercmd.split(None, 1) if isinstance(pagercmd, str) else pagercmd
+    return bool(argv) and os.path.basename(argv[0]) in _termios_safe_pagers
 
 
 @contextlib.contextmanager
@@ -63,8 +99,11 @@ def pager_redirect(desc, *, pagercmd=None, istty=None, file=None,
     subs = {"desc": desc}
     if substitutions is not None:
         subs.update(substitutions)
-    pagercmd = pagercmd.format(**subs)
-    with tty_restoration():
+    if isinstance(pagercmd, str):
+        pagercmd = pagercmd.format(**subs)
+    else:
+        pagercmd = tuple(x.format(**subs) for x in pagercmd)
+    with tty_restoration(termios_save=not _restores_termios(pagercmd)):
         p = pager_process(pagercmd)
         if istty is None:
             p.stdin.isatty = file.isatty
@@ -82,8 +121,9 @@ def pager_redirect(desc, *, pagercmd=None, istty=None, file=None,
                 p.stdin.close()
             except BrokenPipeError:
                 pass
-            while p.poll() is None:
+            while True:
                 try:
                     p.wait()
                 except KeyboardInterrupt:
-                    pass
+                    continue
+                break
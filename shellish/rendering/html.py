@@ -4,7 +4,6 @@ to a text file in human readable format.
 """
 
 import collections
-import re
 import warnings
 from . import vtml
 from html import parser
@@ -30,36 +29,55 @@ class HTMLConv(parser.HTMLParser):
         "pre"
     }
 
-    whitespace = re.compile(r'\s+')
+    @classmethod
+    def _get_dispatch(cls):
+        """ Map tag names to their start/end handler functions.  Built once
+        per class so subclasses can add or override handlers. """
+        try:
+            return cls.__dict__['_dispatch']
+        except KeyError:
+            pass
+        start_handlers = {}
+        end_handlers = {}
+        for name in dir(cls):
+            if name.startswith('handle_start_'):
+                start_handlers[name[13:]] = getattr(cls, name)
+            elif name.startswith('handle_end_'):
+                end_handlers[name[11:]] = getattr(cls, name)
+        cls._dispatch = start_handlers, end_handlers
+        return cls._dispatch
 
     def reset(self):
+        self.start_handlers, self.end_handlers = self._get_dispatch()
         self.buf = []
         self.tag_stack = []
-        self.tag_attrs = collections.defaultdict(list)
+        self.tag_attrs = {}
+        self.list_stack = []
+        self.code_starts = []
+        self.strip_depth = 0
+        self.raw_depth = 0
         super().reset()
 
     def stripping(self):
-        for x in self.strip:
-            if x in self.tag_stack:
-                return True
-        return False
+        return self.strip_depth > 0
 
     def preserve_whitespace(self):
-        for x in self.raw:
-            if x in self.tag_stack:
-                return True
-        return False
+        return self.raw_depth > 0
 
     def handle_starttag(self, tag, attrs):
         if tag in self.noop:
             return
         self.tag_stack.append(tag)
-        if tag not in self.strip:
-            handler = getattr(self, 'handle_start_%s' % tag, None)
+        if tag in self.raw:
+            self.raw_depth += 1
+        if tag in self.strip:
+            self.strip_depth += 1
+        else:
+            handler = self.start_handlers.get(tag)
             if handler:
                 attrs = collections.OrderedDict(attrs)
-                self.tag_attrs[tag].append(attrs)
-                handler(tag, attrs)
+                self.tag_attrs.setdefault(tag, []).append(attrs)
+                handler(self, tag, attrs)
             else:
                 warnings.warn('unhandled tag: %s' % tag)
 
@@ -71,18 +89,39 @@ class HTMLConv(parser.HTMLParser):
                           self.tag_stack[-1]))
             return
         del self.tag_stack[-1]
-        if tag not in self.strip:
-            handler = getattr(self, 'handle_end_%s' % tag, None)
+        if tag in self.raw:
+            self.raw_depth -= 1
+        if tag in self.strip:
+            self.strip_depth -= 1
+        else:
+            handler = self.end_handlers.get(tag)
             if handler:
                 attrs = self.tag_attrs[tag].pop()
-                handler(tag, attrs)
+                handler(self, tag, attrs)
 
     def handle_data(self, data):
         if not self.stripping():
             if not self.preserve_whitespace():
-                data = self.whitespace.sub(' ', data)
+                data = self.collapse_whitespace(data)
             self.buf.append(data)
 
+    def collapse_whitespace(self, data):
+        """ Reduce each run of whitespace to a single space.  Same result as
+        a regex substitution of whitespace runs but str.split is much
+        faster. """
+        if data.isprintable() and '  ' not in data:
+            # Only single spaces (the one printable whitespace); already clean.
+            return data
+        words = data.split()
+        if not words:
+            return ' ' if data else data
+        collapsed = ' '.join(words)
+        if data[0].isspace():
+            collapsed = ' ' + collapsed
+        if data[-1].isspace():
+            collapsed += ' '
+        return collapsed
+
     def handle_start_b(self, tag, attrs):
         self.buf.append('<b>')
     handle_start_strong = handle_start_b
@@ -128,9 +167,7 @@ class HTMLConv(parser.HTMLParser):
 
     def handle_end_a(self, tag, attrs):
         href = attrs.get('href')
-        if href:
-            self.buf.append(' (%s)' % href)
-        self.buf.append('</u></blue>')
+        self.buf.append(' (%s)</u></blue>' % href if href else '</u></blue>')
 
     def handle_start_p(self, tag, attrs):
         self.buf.append('\n')
@@ -145,23 +182,18 @@ class HTMLConv(parser.HTMLParser):
         pass
 
     def handle_start_ol(self, tag, attrs):
+        self.list_stack.append((tag, attrs))
         self.buf.append('\n')
 
     def handle_end_ol(self, tag, attrs):
+        self.list_stack.pop()
         self.buf.append('\n')
-
-    def handle_start_ul(self, tag, attrs):
-        self.buf.append('\n')
-
-    def handle_end_ul(self, tag, attrs):
-        self.buf.append('\n')
+    handle_start_ul = handle_start_ol
+    handle_end_ul = handle_end_ol
 
     def handle_start_li(self, tag, attrs):
-        for x in reversed(self.tag_stack):
-            if x in ('ul', 'ol'):
-                list_attrs = self.tag_attrs[x][-1]
-                tag = x
-                break
+        if self.list_stack:
+            tag, list_attrs = self.list_stack[-1]
         else:
             warnings.warn("Bad LI tag is outside UL or OL")
         if tag == 'ol':
@@ -175,24 +207,23 @@ class HTMLConv(parser.HTMLParser):
         self.buf.append('\n')
 
     def handle_start_code(self, tag, attrs):
-        pass
+        self.code_starts.append(len(self.buf))
 
     def handle_end_code(self, tag, attrs):
-        lines = self.buf.pop().splitlines()
-        width = len(max(lines, key=len))
-        fmt = '  <bgblack><green>  %%-%ds  </green></bgblack>\n' % width
-        self.buf.append('\n')
-        self.buf.append(fmt % '')
-        for line in lines:
-            self.buf.append(fmt % line)
-        self.buf.append(fmt % '')
+        start = self.code_starts.pop()
+        lines = ''.join(self.buf[start:]).splitlines()
+        del self.buf[start:]
+        width = max(map(len, lines), default=0)
+        fmt = '  <bgblack><green>  %s  </green></bgblack>\n'
+        blank = fmt % (' ' * width)
+        body = ''.join(fmt % x.ljust(width) for x in lines)
+        self.buf.append('\n%s%s%s' % (blank, body, blank))
 
     def handle_start_img(self, tag, attrs):
-        self.buf.append('<cyan><u>')
         if 'alt' in attrs:
-            self.buf.append('%s (%s)' % (attrs['alt'], attrs['src']))
+            self.buf.append('<cyan><u>%s (%s)' % (attrs['alt'], attrs['src']))
         else:
-            self.buf.append(attrs['src'])
+            self.buf.append('<cyan><u>%s' % attrs['src'])
 
     def handle_end_img(self, tag, attrs):
         self.buf.append('</u></cyan>')
@@ -200,19 +231,15 @@ class HTMLConv(parser.HTMLParser):
     def getvalue(self):
         return ''.join(self.buf)
 
-htmlconv = HTMLConv()
-
 
 def html2vtml(vtmarkup):
     """ Convert hypertext markup into vt markup.
     The output can be given to `vtmlrender` for converstion to VT100
     sequences. """
-    try:
-        htmlconv.feed(vtmarkup)
-        htmlconv.close()
-        return htmlconv.getvalue()
-    finally:
-        htmlconv.reset()
+    htmlconv = HTMLConv()
+    htmlconv.feed(vtmarkup)
+    htmlconv.close()
+    return htmlconv.getvalue()
 
 
 def htmlrender(htmarkup, **kwargs):
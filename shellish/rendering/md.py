@@ -11,7 +11,8 @@ _md = markdown2.Markdown(extras=['fenced-code-blocks'])
 
 def mdconvert(markdown):
     html = _md.convert(markdown)
-    return html[:-1]
+    # Only trim the trailing newline markdown2 adds when it is actually there.
+    return html[:-1] if html.endswith('\n') else html
 
 
 def mdrender(markdown, **kwargs):
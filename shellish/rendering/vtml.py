@@ -2,8 +2,10 @@
 Functions for displaying content with screen aware layout.
 """
 
+import bisect
 import enum
 import functools
+import itertools
 import html.parser
 import re
 import sys
@@ -34,12 +36,28 @@ TAGS = {
 }
 
 
+class _TagOpcodes(dict):
+    """ VT100 opcodes for each tag, prebuilt from TAGS.  Tags added to TAGS
+    later on are still supported by formatting them on demand. """
+
+    def __missing__(self, tag):
+        return '\033[%dm' % TAGS[tag]
+
+
+_tag_opcodes = _TagOpcodes((k, '\033[%dm' % v) for k, v in TAGS.items())
+
+
 def beststr(*strings):
     """ Test if the output device can handle the desired strings. The options
     should be sorted by preference. Eg. beststr(unicode, ascii). """
+    return _beststr(sys.stdout.encoding, strings)
+
+
+@functools.lru_cache()
+def _beststr(encoding, strings):
     for x in strings:
         try:
-            x.encode(sys.stdout.encoding)
+            x.encode(encoding)
         except UnicodeEncodeError:
             pass
         else:
@@ -50,32 +68,38 @@ def beststr(*strings):
 #  * Splits by spaces, newlines and hypens.
 #  * Hypens are kept on leftmost word.
 #  * Newlines are not grouped with other whitespace.
-#  * Other whitespace is grouped.
+#  * Other whitespace is grouped, so a chunk is whitespace if its first
+#    character is.
 _textwrap_word_break = re.compile('(\n|[ \t\f\v\r]+|[^\s]+?-+)')
-_whitespace = re.compile('[ \t\f\v\r]+')
+# Splits markup into text and tag parts; the text is at every third index.
+_vtml_tag_split = re.compile(r'<(/?)(\w+)>')
+_whitespace = ' \t\f\v\r'
 
 
 def is_whitespace(value):
-    return not not _whitespace.match(value)
-
-
-def _add_slice(seq, slc):
-    """ Our textwrap routine deals in slices.  This function will concat
-    contiguous slices as an optimization so lookup performance is faster.
-    It expects a sequence (probably a list) to add slice to or will extend
-    the last slice of the sequence if it ends where the new slice begins. """
-    if seq and seq[-1].stop == slc.start:
-        seq[-1] = slice(seq[-1].start, slc.stop)
+    """ True if `value` is entirely made of non-newline whitespace. """
+    return bool(value) and not value.strip(_whitespace)
+
+
+def _add_span(seq, start, stop):
+    """ Our textwrap routine deals in spans of offsets, stored flat as start
+    and stop pairs in a list.  This function will concat contiguous spans as
+    an optimization so lookup performance is faster.  It expects a list to
+    add the span to or will extend the last span of the list if it ends
+    where the new span begins. """
+    if seq and seq[-1] == start:
+        seq[-1] = stop
     else:
-        seq.append(slc)
+        seq.extend((start, stop))
 
 
 def _textwrap_slices(text, width, strip_leading_indent=False):
     """ Nearly identical to textwrap.wrap except this routine is a tad bit
     safer in its algo that textwrap.  I ran into some issues with textwrap
     output that make it unusable to this usecase as a baseline text wrapper.
-    Further this utility returns slices instead of strings.  So the slices
-    can be used to extract your lines manually. """
+    Further this utility returns slice offsets instead of strings.  Each line
+    is a flat list of start and stop pairs that can be used to extract your
+    lines manually. """
     if not isinstance(text, str):
         raise TypeError("Expected `str` type")
     chunks = (x for x in _textwrap_word_break.split(text) if x)
@@ -89,15 +113,15 @@ def _textwrap_slices(text, width, strip_leading_indent=False):
         chunk = next(chunks)
     except StopIteration:
         chunk = ''
-    if not strip_leading_indent and is_whitespace(chunk):
+    if not strip_leading_indent and chunk and chunk[0] in _whitespace:
         # Add leading indent for first line, but only up to one lines worth.
         chunk_len = len(chunk)
         if chunk_len >= width:
-            _add_slice(buf, slice(0, width))
+            _add_span(buf, 0, width)
             buf = []
             lines.append(buf)
         else:
-            _add_slice(buf, slice(0, chunk_len))
+            _add_span(buf, 0, chunk_len)
             remaining -= chunk_len
         pos = chunk_len
         try:
@@ -113,16 +137,16 @@ def _textwrap_slices(text, width, strip_leading_indent=False):
             whitespace = []
             whitespace_len = 0
             remaining = width
-        elif is_whitespace(chunk):
+        elif chunk and chunk[0] in _whitespace:
             if buf:
-                _add_slice(whitespace, slice(pos, pos + chunk_len))
+                _add_span(whitespace, pos, pos + chunk_len)
                 whitespace_len += chunk_len
         elif len(chunk) > avail_len:
             if not buf:
                 # Must hard split the chunk.
-                for x in whitespace:
-                    _add_slice(buf, x)
-                _add_slice(buf, slice(pos, pos + avail_len))
+                for i in range(0, len(whitespace), 2):
+                    _add_span(buf, whitespace[i], whitespace[i + 1])
+                _add_span(buf, pos, pos + avail_len)
                 chunk = chunk[avail_len:]
                 pos += avail_len
             # Bump to next line without fetching the next chunk.
@@ -135,11 +159,11 @@ def _textwrap_slices(text, width, strip_leading_indent=False):
         else:
             if buf:
                 remaining -= whitespace_len
-                for x in whitespace:
-                    _add_slice(buf, x)
+                for i in range(0, len(whitespace), 2):
+                    _add_span(buf, whitespace[i], whitespace[i + 1])
             whitespace = []
             whitespace_len = 0
-            _add_slice(buf, slice(pos, pos + chunk_len))
+            _add_span(buf, pos, pos + chunk_len)
             remaining -= chunk_len
         pos += chunk_len
         try:
@@ -156,10 +180,17 @@ class VTMLParser(html.parser.HTMLParser):
     escape_setinal_base = 0xe2c6  # protected by PAU
 
     def __init__(self, *args, **kwargs):
-        escape_tuples = enumerate(self.escape, self.escape_setinal_base)
-        self.escape_map = tuple((chr(i), x) for i, x in escape_tuples)
+        self.escape_map = self._make_escape_map(self.escape,
+                                                self.escape_setinal_base)
         super().__init__(*args, **kwargs)
 
+    @staticmethod
+    @functools.lru_cache()
+    def _make_escape_map(escape, base):
+        """ The map only depends on class attrs so share it between the
+        short-lived parser instances. """
+        return tuple((chr(i), x) for i, x in enumerate(escape, base))
+
     def feed(self, data):
         """ We need to prevent insertion of some special HTML characters
         (entity refs and maybe more).  It's hard to prevent the state machine
@@ -169,7 +200,30 @@ class VTMLParser(html.parser.HTMLParser):
         for mark, special in self.escape_map:
             assert mark not in data
             data = data.replace(special, mark)
-        super().feed(data)
+        if self.rawdata or self.cdata_elem or not self.feed_simple(data):
+            super().feed(data)
+
+    def feed_simple(self, data):
+        """ Most markup is just known tags around plain text.  That can be
+        handled with a regex split and none of the general purpose (and slow)
+        HTMLParser state machine.  Returns False without consuming anything
+        if the markup has other content. """
+        parts = _vtml_tag_split.split(data)
+        for i in range(0, len(parts), 3):
+            if '<' in parts[i]:
+                return False
+        for i in range(2, len(parts), 3):
+            if parts[i] not in TAGS:
+                return False
+        for i in range(0, len(parts), 3):
+            if i:
+                if parts[i - 2]:
+                    self.handle_endtag(parts[i - 1])
+                else:
+                    self.handle_starttag(parts[i - 1], [])
+            if parts[i]:
+                self.handle_data(parts[i])
+        return True
 
     def reset(self):
         self.closed = False
@@ -223,13 +277,24 @@ class VTMLParser(html.parser.HTMLParser):
         return self.vbuf
 
 
-@functools.total_ordering
+_RESET_OP, _TAG_OP, _STR_OP = range(3)
+
+
+def _invalid_op(op):
+    raise ValueError("invalid op: %r" % (op,))
+
+
 class VTMLBuffer(object):
     """ A str-like object that has an adjusted length to compensate for
-    nonvisual vt100 opcodes which do not occupy space in the output. """
+    nonvisual vt100 opcodes which do not occupy space in the output.
+
+    Internally the buffer is a pair of parallel lists; `_ops` holds the
+    integer opcode of each segment and `_vals` holds its argument (the text
+    or tag name).  The rendered forms are cached until the next mutation. """
 
-    ops = enum.Enum('ops', 'reset tag str')
+    ops = enum.IntEnum('ops', 'reset tag str', start=0)
     _reset_opcode = '\033[0m'
+    _merge_limit = 256
 
     @classmethod
     def new(cls, *args, **kwargs):
@@ -245,7 +310,12 @@ class VTMLBuffer(object):
         return new
 
     def __init__(self, value=None):
-        self._values = []
+        self._ops = []
+        self._vals = []
+        self._str_cache = None
+        self._text_cache = None
+        self._offsets_cache = None
+        self._text_len = 0
         if value is not None:
             if isinstance(value, str):
                 self.append_str(value)
@@ -255,20 +325,22 @@ class VTMLBuffer(object):
                 raise TypeError("Init value must be `str` or `VTMLBuffer`")
 
     def __len__(self):
-        return len(self.text())
+        """ Visual length, tracked as text is added. """
+        return self._text_len
 
     def __str__(self):
-        buf = []
-        for op, val in self._values:
-            if op == self.ops.str:
-                buf.append(val)
-            elif op == self.ops.tag:
-                buf.append('\033[%dm' % TAGS[val])
-            elif op == self.ops.reset:
-                buf.append(self._reset_opcode)
-            else:
-                raise ValueError("invalid op: %r" % (op,))
-        return ''.join(buf)
+        if self._str_cache is not None:
+            return self._str_cache
+        tag_opcodes = _tag_opcodes
+        reset_opcode = self._reset_opcode
+        str_op, tag_op, reset_op = _STR_OP, _TAG_OP, _RESET_OP
+        self._str_cache = ''.join([
+            val if op == str_op else
+            tag_opcodes[val] if op == tag_op else
+            reset_opcode if op == reset_op else
+            _invalid_op(op)
+            for op, val in zip(self._ops, self._vals)])
+        return self._str_cache
 
     def __repr__(self):
         return repr(str(self))
@@ -279,6 +351,20 @@ class VTMLBuffer(object):
     def __lt__(self, other):
         return str(self) < str(other)
 
+    def __le__(self, other):
+        return str(self) <= str(other)
+
+    def __gt__(self, other):
+        return str(self) > str(other)
+
+    def __ge__(self, other):
+        return str(self) >= str(other)
+
+    def __hash__(self):
+        """ Hashes like the rendered `str` so it agrees with `__eq__`.  A
+        buffer should not be mutated while used as a key; see `freeze`. """
+        return hash(str(self))
+
     def __contains__(self, other):
         return other in self.text()
 
@@ -292,13 +378,13 @@ class VTMLBuffer(object):
         if fmt == 'vtml':
             buf = []
             tag_stack = []
-            for op, val in self._values:
-                if op == self.ops.str:
+            for op, val in zip(self._ops, self._vals):
+                if op == _STR_OP:
                     buf.append(val)
-                elif op == self.ops.tag:
+                elif op == _TAG_OP:
                     tag_stack.append(val)
                     buf.append('<%s>' % val)
-                elif op == self.ops.reset:
+                elif op == _RESET_OP:
                     if tag_stack:
                         for x in reversed(tag_stack):
                             buf.append('</%s>' % x)
@@ -319,6 +405,8 @@ class VTMLBuffer(object):
         return new
 
     def __iadd__(self, other):
+        if self.frozen:
+            return self + other
         if isinstance(other, str):
             self.append_str(other)
         elif isinstance(other, VTMLBuffer):
@@ -339,7 +427,10 @@ class VTMLBuffer(object):
         if not isinstance(factor, int):
             raise TypeError('Expected `int` type factor')
         new = self.copy()
-        new._values *= factor
+        new._ops *= factor
+        new._vals *= factor
+        new._text_len *= max(factor, 0)
+        new._invalidate()
         return new
 
     __rmul__ = __mul__
@@ -347,7 +438,12 @@ class VTMLBuffer(object):
     def __imul__(self, factor):
         if not isinstance(factor, int):
             raise TypeError('Expected `int` type factor')
-        self._values *= factor
+        if self.frozen:
+            return self * factor
+        self._ops *= factor
+        self._vals *= factor
+        self._text_len *= max(factor, 0)
+        self._invalidate()
         return self
 
     def __getitem__(self, key):
@@ -372,18 +468,34 @@ class VTMLBuffer(object):
             stop = start + 1
         remaining = max(stop - start, 0)
         new = self.new()
-        op_active = False
-        pos = 0
-        for op, val in self._values:
+        if not remaining:
+            return new
+        # Jump to the first segment containing `start`.  Of the segments we
+        # skip, only tags opened since the last reset still apply.
+        ends = self._text_offsets()
+        first = bisect.bisect_right(ends, start)
+        ops = self._ops
+        vals = self._vals
+        i = first
+        while i and ops[i - 1] != _RESET_OP:
+            i -= 1
+        for i in range(i, first):
+            if ops[i] == _TAG_OP:
+                new.append_tag(vals[i])
+        op_active = bool(new._ops)
+        pos = ends[first - 1] if first else 0
+        for i in range(first, len(ops)):
             if not remaining:
                 break
-            elif op == self.ops.tag:
+            op = ops[i]
+            val = vals[i]
+            if op == _TAG_OP:
                 new.append_tag(val)
                 op_active = True
-            elif op == self.ops.reset:
+            elif op == _RESET_OP:
                 new.append_reset()
                 op_active = False
-            elif op == self.ops.str:
+            elif op == _STR_OP:
                 snip = val[start - pos:] if start > pos else val
                 pos += len(val)
                 if snip:
@@ -396,22 +508,85 @@ class VTMLBuffer(object):
             new.append_reset()
         return new
 
+    def _text_offsets(self):
+        """ The text offset at the end of each segment.  Cached like the
+        rendered forms so repeated slicing can bisect into the buffer. """
+        if self._offsets_cache is None:
+            self._offsets_cache = list(itertools.accumulate(
+                len(val) if op == _STR_OP else 0
+                for op, val in zip(self._ops, self._vals)))
+        return self._offsets_cache
+
     def copy(self):
-        return self.new(self)
+        new = self.new(self)
+        new._str_cache = self._str_cache
+        new._text_cache = self._text_cache
+        return new
+
+    def freeze(self):
+        """ Make this buffer read-only so it can be safely used as a dict key
+        or cached.  Appending to a frozen buffer raises `TypeError`, and
+        in-place operators return a new buffer.  Use `copy` to get a mutable
+        buffer again. """
+        self._ops = tuple(self._ops)
+        self._vals = tuple(self._vals)
+        return self
+
+    @property
+    def frozen(self):
+        return isinstance(self._ops, tuple)
+
+    def _check_mutable(self):
+        if self.frozen:
+            raise TypeError("Frozen `VTMLBuffer` cannot be modified")
+
+    def _invalidate(self):
+        """ Must be called after any change to the ops/vals lists. """
+        self._str_cache = self._text_cache = self._offsets_cache = None
 
     def append_reset(self):
-        self._values.append((self.ops.reset, None))
+        self._check_mutable()
+        self._ops.append(_RESET_OP)
+        self._vals.append(None)
+        self._invalidate()
 
     def append_tag(self, tag):
-        self._values.append((self.ops.tag, tag))
+        self._check_mutable()
+        self._ops.append(_TAG_OP)
+        self._vals.append(tag)
+        self._invalidate()
 
     def append_str(self, value):
-        self._values.append((self.ops.str, value))
+        """ Adjacent text is merged into one segment to keep the segment
+        lists short.  Merging stops once a segment reaches `_merge_limit`
+        so that many small appends don't turn quadratic. """
+        self._check_mutable()
+        if self._ops and self._ops[-1] == _STR_OP and \
+           len(self._vals[-1]) < self._merge_limit:
+            self._vals[-1] += value
+        else:
+            self._ops.append(_STR_OP)
+            self._vals.append(value)
+        self._text_len += len(value)
+        self._invalidate()
 
     def extend(self, buf):
         if not isinstance(buf, VTMLBuffer):
             raise TypeError("Expected `VTMLBuffer`")
-        self._values.extend(buf._values)
+        self._check_mutable()
+        ops = buf._ops
+        vals = buf._vals
+        if ops and self._ops and self._ops[-1] == _STR_OP and \
+           ops[0] == _STR_OP and len(self._vals[-1]) < self._merge_limit:
+            # Take the slices first; `buf` may be `self`.
+            first = vals[0]
+            ops = ops[1:]
+            vals = vals[1:]
+            self._vals[-1] += first
+        self._ops.extend(ops)
+        self._vals.extend(vals)
+        self._text_len += buf._text_len
+        self._invalidate()
 
     def _promiscuous_extend(self, buf, other):
         """ Extend that supports `VTMLBuffer` and `str`. """
@@ -438,16 +613,26 @@ class VTMLBuffer(object):
             self._promiscuous_extend(output, buf)
         return output
 
+    def _str_vals(self):
+        """ List of just the str segment values. """
+        return [val for op, val in zip(self._ops, self._vals)
+                if op == _STR_OP]
+
     def text(self):
         """ Return just the text content of this string without opcodes. """
-        return ''.join(val for op, val in self._values if op == self.ops.str)
+        if self._text_cache is None:
+            self._text_cache = ''.join(self._str_vals())
+        return self._text_cache
 
     def plain(self):
         """ Similar to `text` but returns valid VTMLBuffer instance. """
+        text = self.text()
         new = self.new()
-        for op, val in self._values:
-            if op == self.ops.str:
-                new.append_str(val)
+        if text:
+            new._ops.append(_STR_OP)
+            new._vals.append(text)
+        new._text_cache = text
+        new._text_len = self._text_len
         return new
 
     def clip(self, length, cliptext=''):
@@ -460,9 +645,15 @@ class VTMLBuffer(object):
             raise ValueError("Clip length too small: %d < %d" % (length,
                              cliplen))
         text = self.text()
-        first = text.splitlines()[0] if text else text
-        stripped = first.rstrip()
-        clipping = len(first) != len(text) or len(stripped) > length
+        if text.isprintable():
+            # No line boundaries possible; skip building the splitlines list.
+            first = text
+            stripped = first.rstrip()
+            clipping = len(stripped) > length
+        else:
+            first = text.splitlines()[0] if text else text
+            stripped = first.rstrip()
+            clipping = len(first) != len(text) or len(stripped) > length
         adj_length = min(len(stripped), length - (cliplen if clipping else 0))
         new = self[:adj_length]
         if clipping and cliptext:
@@ -474,20 +665,24 @@ class VTMLBuffer(object):
         sequences by returning a list of VTMLBuffer objects. """
         if width <= 0:
             raise ValueError("Invalid wrap width: %d" % width)
-        slices = _textwrap_slices(self.text(), width, **options)
-        return [self.from_buffers(self[s] for s in line_slices)
-                for line_slices in slices]
+        lines = _textwrap_slices(self.text(), width, **options)
+        # Slice every line in one pass and then regroup the pieces.
+        pieces = iter(self._slices(list(itertools.chain.from_iterable(lines))))
+        return [self.from_buffers(itertools.islice(pieces, len(spans) // 2))
+                for spans in lines]
 
     def ljust(self, width, fillchar=' '):
         new = self.copy()
-        if width > len(self):
-            new.append_str(fillchar * (width - len(self)))
+        padlen = width - len(self)
+        if padlen > 0:
+            new.append_str(fillchar * padlen)
         return new
 
     def rjust(self, width, fillchar=' '):
         new = self.new()
-        if width > len(self):
-            new.append_str(fillchar * (width - len(self)))
+        padlen = width - len(self)
+        if padlen > 0:
+            new.append_str(fillchar * padlen)
         new.extend(self)
         return new
 
@@ -495,33 +690,46 @@ class VTMLBuffer(object):
         """ Center strings so uneven padding always favors trailing pad.  When
         centering clumps of text this produces better results than str.center
         which alternates which side uneven padding occurs on. """
-        if width > len(self):
-            padlen = width - len(self)
-            leftlen = padlen // 2
-            rightlen = padlen - leftlen
-            new = self.new()
-            new.append_str(fillchar * leftlen)
-            new.extend(self)
-            new.append_str(fillchar * rightlen)
-            return new
-        else:
+        padlen = width - len(self)
+        if padlen <= 0:
             return self.copy()
+        leftlen = padlen // 2
+        new = self.new()
+        new.append_str(fillchar * leftlen)
+        new.extend(self)
+        new.append_str(fillchar * (padlen - leftlen))
+        return new
 
     def rstrip(self):
-        """ Removing trailing whitespace. """
-        removals = []
-        i = len(self._values)
-        for op, val in reversed(self._values):
-            i -= 1
-            if op == self.ops.str:
-                if is_whitespace(val):
-                    removals.append(i)
-                else:
+        """ Removing trailing whitespace.  Newlines are preserved. """
+        ops = self._ops
+        vals = self._vals
+        trims = {}
+        for i in range(len(ops) - 1, -1, -1):
+            if ops[i] == _STR_OP:
+                stripped = vals[i].rstrip(_whitespace)
+                if stripped != vals[i]:
+                    trims[i] = stripped
+                if stripped:
                     break
-        copy = self.copy()
-        for i in removals:
-            del copy._values[i]
-        return copy
+        if not trims:
+            return self.copy()
+        # Only the tail past the first trimmed segment needs rebuilding.
+        cut = min(trims)
+        new = self.new()
+        new._ops.extend(ops[:cut])
+        new._vals.extend(vals[:cut])
+        new._text_len = self._text_len - sum(len(vals[i]) - len(x)
+                                             for i, x in trims.items())
+        for i in range(cut, len(ops)):
+            if i in trims:
+                if trims[i]:
+                    new._ops.append(_STR_OP)
+                    new._vals.append(trims[i])
+            else:
+                new._ops.append(ops[i])
+                new._vals.append(vals[i])
+        return new
 
     def startswith(self, other):
         return self.text().startswith(other)
@@ -529,46 +737,127 @@ class VTMLBuffer(object):
     def endswith(self, other):
         return self.text().endswith(other)
 
+    def _slices(self, spans):
+        """ Equivalent to `[self[start:stop], ...]` for a flat list of start
+        and stop pairs.  The starts must not decrease, which lets one forward
+        walk of the segments serve every slice. """
+        ops = self._ops
+        vals = self._vals
+        ends = self._text_offsets()
+        nops = len(ops)
+        prefix_ops = []
+        prefix_vals = []
+        i = 0
+        pieces = []
+        for x in range(0, len(spans), 2):
+            start = spans[x]
+            new = self.new()
+            pieces.append(new)
+            remaining = spans[x + 1] - start
+            if remaining <= 0:
+                continue
+            # Tags still open from skipped segments carry into the slice.
+            while i < nops and ends[i] <= start:
+                if ops[i] == _TAG_OP:
+                    prefix_ops.append(_TAG_OP)
+                    prefix_vals.append(vals[i])
+                elif ops[i] == _RESET_OP:
+                    prefix_ops.clear()
+                    prefix_vals.clear()
+                i += 1
+            new._ops.extend(prefix_ops)
+            new._vals.extend(prefix_vals)
+            op_active = bool(prefix_ops)
+            pos = ends[i - 1] if i else 0
+            for ii in range(i, nops):
+                if not remaining:
+                    break
+                op = ops[ii]
+                val = vals[ii]
+                if op == _TAG_OP:
+                    new.append_tag(val)
+                    op_active = True
+                elif op == _RESET_OP:
+                    new.append_reset()
+                    op_active = False
+                else:
+                    snip = val[start - pos:] if start > pos else val
+                    pos += len(val)
+                    if snip:
+                        fragment = snip[:remaining]
+                        remaining -= len(fragment)
+                        new.append_str(fragment)
+            if op_active:
+                new.append_reset()
+        return pieces
+
     def split(self, sep=' ', maxsplit=None):
         if not sep:
             raise ValueError("empty separator")
-        splits = []
-        pos = 0
         text = self.text()
-        sep_len = len(sep)
-        while maxsplit is None or len(splits) < maxsplit:
-            try:
-                end = text.index(sep, pos)
-            except ValueError:
-                break
-            splits.append((pos, end))
-            pos = end + sep_len
-        splits.append((pos, None))
-        return [self[start:end] for start, end in splits]
-        if splits:
-            return [self[start:end] for start, end in splits]
+        if maxsplit is None:
+            parts = text.split(sep)
         else:
-            return [self.copy()]
+            parts = text.split(sep, maxsplit)
+        spans = []
+        start = 0
+        sep_len = len(sep)
+        for part in parts:
+            stop = start + len(part)
+            spans.extend((start, stop))
+            start = stop + sep_len
+        return self._slices(spans)
+
 
+def _vtmlparse(vtmarkup):
+    parser = VTMLParser()
+    parser.feed(vtmarkup)
+    parser.close()
+    return parser.getvalue()
 
-def vtmlrender(vtmarkup, plain=None, strict=False, vtmlparser=VTMLParser()):
-    """ Look for vt100 markup and render vt opcodes into a VTMLBuffer. """
+
+# Memoized parsing for short markup such as prompts and table cells.  The
+# buffers returned are shared by all callers so they must be copied before
+# being handed out.  Longer markup (whole documents, log lines) is rarely
+# repeated and would only pin memory in the cache.
+_vtmlparse_cached = functools.lru_cache(maxsize=1024)(_vtmlparse)
+_vtmlparse_cache_limit = 256
+
+
+def vtmlrender(vtmarkup, plain=None, strict=False, vtmlparser=None):
+    """ Look for vt100 markup and render vt opcodes into a VTMLBuffer.  The
+    parsing of short repeated markup is cached unless a custom `vtmlparser`
+    is provided, in which case it is reset after use so it may be reused by
+    the caller. """
     if isinstance(vtmarkup, VTMLBuffer):
         return vtmarkup.plain() if plain else vtmarkup
+    if isinstance(vtmarkup, str) and '<' not in vtmarkup:
+        # Without tags there is nothing for the parser to do.
+        return VTMLBuffer(vtmarkup) if vtmarkup else VTMLBuffer()
+    shared = False
     try:
-        vtmlparser.feed(vtmarkup)
-        vtmlparser.close()
+        if vtmlparser is None:
+            if len(vtmarkup) <= _vtmlparse_cache_limit:
+                buf = _vtmlparse_cached(vtmarkup)
+                shared = True
+            else:
+                buf = _vtmlparse(vtmarkup)
+        else:
+            try:
+                vtmlparser.feed(vtmarkup)
+                vtmlparser.close()
+                buf = vtmlparser.getvalue()
+            finally:
+                vtmlparser.reset()
     except:
         if strict:
             raise
         buf = VTMLBuffer()
         buf.append_str(str(vtmarkup))
         return buf
-    else:
-        buf = vtmlparser.getvalue()
-        return buf.plain() if plain else buf
-    finally:
-        vtmlparser.reset()
+    if plain:
+        return buf.plain()
+    return buf.copy() if shared else buf
 
 
 def vtmlprint(*values, plain=None, strict=None, **options):
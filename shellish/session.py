@@ -3,22 +3,33 @@ Session context for commands.  This provides singular state mgmt for a tree
 of commands as well as the implementation for interactive mode.
 """
 
-import ast
 import configparser
 import contextlib
+import functools
 import os.path
-import pdb
+import re
 import readline
 import shutil
 import sys
 import traceback
 from . import eventing, rendering
 
+_prompt_escapes = re.compile(r'\\(?:[\n\\\'"abfnrtv]|[0-7]{1,3}|'
+                             r'x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|'
+                             r'U[0-9a-fA-F]{8}|N\{[\w -]+\})', re.ASCII)
+
 
 def _vprinterr(*args, **kwargs):
     return rendering.vtmlprint(*args, file=sys.stderr, **kwargs)
 
 
+@functools.lru_cache(maxsize=16)
+def _completer_delims(delims, includes, excludes):
+    """ The readline delims are set around every line of input but they
+    rarely change, so the adjusted string is reused. """
+    return ''.join((set(delims) | includes) - excludes)
+
+
 class SessionExit(BaseException):
     pass
 
@@ -34,6 +45,7 @@ class Session(eventing.Eventer):
     completer_delim_excludes = frozenset('-+@:/~*')
     pad_completion = True
     allow_pager = bool(os.environ.get('PAGER', True))
+    _completion_width = None
 
     @property
     def config_file(self):
@@ -49,7 +61,11 @@ class Session(eventing.Eventer):
         self.config = self.load_config()
         self.add_events(['precmd', 'postcmd'])
         raw_prompt = self.config['ui']['prompt_format']
-        self.prompt_format = ast.literal_eval("'%s '" % raw_prompt)
+        # Decode backslash escapes (e.g. "\n") from the config value.  Other
+        # text, including stray backslashes, is left as is.
+        self.prompt_format = _prompt_escapes.sub(
+            lambda m: m.group().encode().decode('unicode_escape'),
+            raw_prompt + ' ')
         super().__init__()
 
     def default_config(self):
@@ -139,6 +155,7 @@ class Session(eventing.Eventer):
         if verbosity == 'traceback':
             self.pretty_print_exc(command, exc, show_traceback=True)
         elif verbosity == 'debug':
+            import pdb  # Heavy import that most programs never need.
             pdb.set_trace()
         elif verbosity == 'raise':
             raise exc
@@ -173,8 +190,8 @@ class Session(eventing.Eventer):
 
     def cmd_split(self, line):
         """ Get the command associated with this input line. """
-        cmd, *args = line.lstrip().split(' ', 1)
-        return self.root_command.subcommands[cmd], ' '.join(args)
+        cmd, _, args = line.lstrip().partition(' ')
+        return self.root_command.subcommands[cmd], args
 
     def completer_hook(self, text, state):
         if state == 0:
@@ -191,23 +208,31 @@ class Session(eventing.Eventer):
                 cfunc = cmd.complete
             else:
                 cfunc = self.complete_names
-            if self.pad_completion:
-                pad = lambda x: x + ' ' if not x.endswith(' ') or \
-                    x.endswith(r'\ ') else x
-            else:
-                pad = lambda x: x
             choices = self.complete_wrap(cfunc, text, line, begin, end)
-            self.completer_cache = list(map(pad, choices))
+            if self.pad_completion:
+                choices = map(self.pad_choice, choices)
+            self.completer_cache = list(choices)
         try:
             return self.completer_cache[state]
         except IndexError:
             return None
 
+    @staticmethod
+    def pad_choice(choice):
+        """ Add a trailing space so readline moves on to the next word.
+        Escaped spaces are part of the choice and still get padded. """
+        if not choice.endswith(' ') or choice.endswith(r'\ '):
+            return choice + ' '
+        return choice
+
     def complete_wrap(self, func, *args, **kwargs):
         """ Readline eats exceptions raised by completer functions. """
         # Workaround readline's one-time-read of terminal width.
         termcols = shutil.get_terminal_size()[0]
-        readline.parse_and_bind('set completion-display-width %d' % termcols)
+        if termcols != self._completion_width:
+            readline.parse_and_bind('set completion-display-width %d' %
+                                    termcols)
+            self._completion_width = termcols
         try:
             return func(*args, **kwargs)
         except:
@@ -215,8 +240,8 @@ class Session(eventing.Eventer):
             raise
 
     def complete_names(self, text, line, begin, end):
-        choices = set(self.root_command.subcommands)
-        return [x for x in choices if x.startswith(line)]
+        return [x for x in self.root_command.subcommands
+                if x.startswith(line)]
 
     @contextlib.contextmanager
     def setup_readline(self):
@@ -225,12 +250,12 @@ class Session(eventing.Eventer):
         readline.parse_and_bind('tab: complete')
         completer_save = readline.get_completer()
         delims_save = readline.get_completer_delims()
-        delims = set(delims_save)
-        delims |= self.completer_delim_includes
-        delims -= self.completer_delim_excludes
+        delims = _completer_delims(delims_save,
+                                   frozenset(self.completer_delim_includes),
+                                   frozenset(self.completer_delim_excludes))
         readline.set_completer(self.completer_hook)
         try:
-            readline.set_completer_delims(''.join(delims))
+            readline.set_completer_delims(delims)
             try:
                 yield
             finally:
@@ -2,7 +2,9 @@
 Sanity tests for the shellish library.
 """
 
+import os
 import shellish
+import tempfile
 import unittest
 
 
@@ -115,3 +117,20 @@ class CommandSanity(unittest.TestCase):
         f = Foo(name='foo')
         self.assertEqual(f.title, None)
         self.assertEqual(f.desc, None)
+
+
+class SessionSanity(unittest.TestCase):
+
+    def prompt_format(self, raw):
+        with tempfile.TemporaryDirectory() as tdir:
+            class TmpSession(shellish.Session):
+                var_dir = tdir
+            with open(os.path.join(tdir, '.test_config'), 'w') as f:
+                f.write("[ui]\nprompt_format = %s\n" % raw)
+            return TmpSession(shellish.Command(name='test')).prompt_format
+
+    def test_prompt_format_escapes(self):
+        self.assertEqual(self.prompt_format("it's\\n{name} \u2192"),
+                         "it's\n{name} \u2192 ")
+        self.assertEqual(self.prompt_format('\\\u2192 \\\\n'),
+                         '\\\u2192 \\n ')
@@ -1,9 +1,11 @@
 
 import os
 import shellish
+import shlex
 import sys
 import tempfile
 import unittest
+from shellish.command import command
 
 
 class TestNesting(unittest.TestCase):
@@ -170,3 +172,14 @@ class ArgumentDestSafety(unittest.TestCase):
         args = c.argparser.parse_known_args(['--foo-bar', 'value'])[0]
         self.assertIn('foo_bar', args)
         self.assertEqual(args.foo_bar, 'value')
+
+
+class ShlexSplit(unittest.TestCase):
+
+    def test_matches_shlex(self):
+        for line in ('', '   ', 'one', 'a b  c', ' lead trail ',
+                     'tab\tsep\tline', 'cr\rsep\r\nline\n', 'a "b c" d',
+                     "a 'b c' d", 'a b\\ c', 'esc\\"aped', 'ünï cödé',
+                     '--foo=bar -x 1', 'a#b # c'):
+            self.assertEqual(command._shlex_split(line), shlex.split(line),
+                             repr(line))
@@ -1,6 +1,8 @@
 import shellish
+import subprocess
 import unittest
 import tempfile
+from unittest import mock
 
 
 class TTYPagingTests(unittest.TestCase):
@@ -47,3 +49,46 @@ class TTYPagingTests(unittest.TestCase):
             self.assertRaises(IOError, open, outfile2)
             with open(outfile1) as f:
                 self.assertEqual(list(f), ['outer\n', 'inner\n'])
+
+    def test_no_shell(self):
+        with tempfile.TemporaryDirectory() as tdir:
+            outfile = '%s/out' % tdir
+            with mock.patch('subprocess.Popen', wraps=subprocess.Popen) as p:
+                with shellish.pager_redirect('test',
+                                             pagercmd='tee %s' % outfile):
+                    print('direct')
+            self.assertEqual(p.call_args[0][0], ['tee', outfile])
+            self.assertNotIn('shell', p.call_args[1])
+            with open(outfile) as f:
+                self.assertEqual(f.read(), 'direct\n')
+
+    def test_blank_pagercmd(self):
+        with mock.patch('subprocess.Popen', wraps=subprocess.Popen) as p:
+            with shellish.pager_redirect('test', pagercmd='   '):
+                try:
+                    print('blank')
+                except BrokenPipeError:
+                    pass
+        self.assertEqual(p.call_count, 1)
+        self.assertTrue(p.call_args[1]['shell'])
+
+    def test_unexecutable_pagercmd(self):
+        with tempfile.TemporaryDirectory() as tdir:
+            cmd = '%s/notexec' % tdir
+            open(cmd, 'w').close()
+            with mock.patch('subprocess.Popen', wraps=subprocess.Popen) as p:
+                with shellish.pager_redirect('test', pagercmd=cmd):
+                    try:
+                        print('unexecutable')
+                    except BrokenPipeError:
+                        pass
+            self.assertEqual(p.call_args_list[0][0][0], [cmd])
+            self.assertTrue(p.call_args[1]['shell'])
+
+    def test_argv_pagercmd(self):
+        with tempfile.TemporaryDirectory() as tdir:
+            outfile = '%s/out' % tdir
+            with shellish.pager_redirect('test', pagercmd=['tee', outfile]):
+                print('argv')
+            with open(outfile) as f:
+                self.assertEqual(f.read(), 'argv\n')
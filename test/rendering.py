@@ -314,10 +314,103 @@ class VTMLBufferTests(unittest.TestCase):
             self.assertIn(valid, ugly)
             self.assertEqual(ugly, line + valid, 'partial conv did not work')
 
+    def test_tagless(self):
+        for t in ('', 'abc', 'a > b', 'a&b', 'tab\tand\nnewline'):
+            buf = R.vtmlrender(t, strict=True)
+            self.assertIsInstance(buf, R.VTMLBuffer)
+            self.assertEqual(buf, t)
+            self.assertEqual(buf.text(), t)
+
+    def test_cached_render_isolation(self):
+        markup = '<b>cached</b>'
+        first = R.vtmlrender(markup)
+        first += ' mutated'
+        first *= 2
+        second = R.vtmlrender(markup)
+        self.assertIsNot(first, second)
+        self.assertEqual(second.text(), 'cached')
+
+    def test_long_render_uncached(self):
+        markup = '<b>%s</b>' % ('x' * R.vtml._vtmlparse_cache_limit)
+        before = R.vtml._vtmlparse_cached.cache_info()
+        s = R.vtmlrender(markup)
+        self.assertEqual(R.vtml._vtmlparse_cached.cache_info(), before)
+        self.assertEqual(s.text(), 'x' * R.vtml._vtmlparse_cache_limit)
+        self.assertIsNot(s, R.vtmlrender(markup))
+
     def test_pound(self):
         for t in ('a#bc', 'a&#1;'):
             self.assertEqual(R.vtmlrender(t, strict=True), t)
 
+    def test_render_cache_invalidation(self):
+        s = R.vtmlrender('<b>foo</b>')
+        self.assertEqual(s.text(), 'foo')
+        rendered = str(s)
+        s.append_str('bar')
+        self.assertEqual(s.text(), 'foobar')
+        self.assertEqual(str(s), rendered + 'bar')
+        s *= 2
+        self.assertEqual(s.text(), 'foobarfoobar')
+        s.extend(R.vtmlrender('baz'))
+        self.assertEqual(len(s), 15)
+
+    def test_slice_closed_tags(self):
+        s = R.vtmlrender('<b>a</b><u>b</u>c')
+        self.assertEqual(str(s[2:]), 'c')
+        self.assertEqual(str(s[1:2]), '\033[4mb\033[0m')
+        self.assertEqual([str(x) for x in s.split('b')],
+                         ['\033[1ma\033[0m', 'c'])
+
+    def test_rstrip(self):
+        self.assertEqual(R.vtmlrender('<b>x</b>  ').rstrip().text(), 'x')
+        self.assertEqual(R.vtmlrender('<b>x</b>  y').rstrip().text(), 'x  y')
+        self.assertEqual(R.vtmlrender('x').rstrip().text(), 'x')
+        self.assertEqual(R.vtmlrender('').rstrip().text(), '')
+        self.assertEqual(R.vtmlrender('<b>x  </b>').rstrip().text(), 'x')
+        self.assertEqual(R.vtmlrender('x \n ').rstrip().text(), 'x \n')
+        self.assertEqual(R.vtmlrender('x').ljust(4).rstrip().text(), 'x')
+
+    def test_merged_text(self):
+        s = R.VTMLBuffer('a')
+        s.append_str('b')
+        s.extend(R.VTMLBuffer('c'))
+        s.extend(s)
+        self.assertEqual(len(s._vals), 1)
+        self.assertEqual(s.text(), 'abcabc')
+        s.append_tag('b')
+        s.append_str('d')
+        self.assertEqual(len(s._vals), 3)
+
+    def test_hash(self):
+        a = R.vtmlrender('<b>A</b>')
+        self.assertEqual(hash(a), hash(R.vtmlrender('<b>A</b>')))
+        self.assertEqual(hash(a), hash(str(a)))
+        self.assertEqual({a: 1}[R.vtmlrender('<b>A</b>')], 1)
+
+    def test_freeze(self):
+        a = R.vtmlrender('<b>A</b>').freeze()
+        self.assertTrue(a.frozen)
+        self.assertRaises(TypeError, a.append_str, 'B')
+        self.assertRaises(TypeError, a.append_tag, 'b')
+        self.assertRaises(TypeError, a.append_reset)
+        self.assertRaises(TypeError, a.extend, R.VTMLBuffer('B'))
+        b = a
+        b += 'B'
+        self.assertIsNot(a, b)
+        self.assertEqual(a.text(), 'A')
+        self.assertEqual(b.text(), 'AB')
+        b = a
+        b *= 2
+        self.assertIsNot(a, b)
+        self.assertEqual(a.text(), 'A')
+        self.assertEqual(b.text(), 'AA')
+        c = a.copy()
+        self.assertFalse(c.frozen)
+        c.append_str('B')
+        self.assertEqual(c.text(), 'AB')
+        self.assertEqual(a[:1], a)
+        self.assertEqual(a.split('x'), [a])
+
     def test_multiply(self):
         a = R.vtmlrender('A')
         self.assertEqual(a * 2, R.vtmlrender('AA'))
@@ -468,6 +561,17 @@ class HTMLConversion(unittest.TestCase):
         self.assertEqual(R.html2vtml('before<script>nope</script>after'),
                          'beforeafter')
 
+    def test_whitespace(self):
+        self.assertEqual(R.html2vtml(' '), ' ')
+        self.assertEqual(R.html2vtml('\n\t '), ' ')
+        self.assertEqual(R.html2vtml('a  b'), 'a b')
+        self.assertEqual(R.html2vtml('\n a \n\n b\t'), ' a b ')
+        self.assertEqual(R.html2vtml('<b> a </b>'), '<b> a </b>')
+
+    def test_empty_code(self):
+        self.assertTrue(R.html2vtml('<b>keep</b><code></code>').startswith(
+                        '<b>keep</b>\n'))
+
     def test_icase_tag(self):
         t = R.vtmlrender('<b>foo</b>')
         self.assertEqual(R.htmlrender('<B>foo</b>'), t)
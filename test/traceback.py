@@ -62,6 +62,15 @@ class TracebackSanity(unittest.TestCase):
                 self.assertTracebackFormat(
                     list(shellish.format_exception(inner)), 'TypeError')
 
+    def test_format_cyclic_context(self):
+        a = ValueError('a')
+        b = TypeError('b')
+        a.__context__ = b
+        b.__context__ = a
+        lines = list(shellish.format_exception(a))
+        self.assertIn('TypeError', lines[1])
+        self.assertIn('ValueError', lines[-1])
+
     def test_print(self):
         buf = io.StringIO()
         try: